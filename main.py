@@ -9,8 +9,21 @@ import asyncio
 import sys
 from pathlib import Path
 
-from src.flow import run_flow, MultiModelFlow
-from src.config import config, get_models_with_status
+from src.flow import run_flow, status_icon, FlowResult, MultiModelFlow
+from src.config import get_models_with_status
+
+
+# פקודות יציאה מהמצב האינטראקטיבי (frozenset - בדיקת חברות ב-O(1),
+# נבנה פעם אחת במקום רשימה חדשה בכל סיבוב של הלולאה)
+_EXIT_COMMANDS = frozenset({"exit", "quit", "q", "יציאה"})
+# שאלה ארוכה מפקודת היציאה הארוכה ביותר ודאי אינה פקודת יציאה -
+# הבדיקה מדלגת על lower() של כל הטקסט שהוקלד
+_MAX_EXIT_LEN = max(map(len, _EXIT_COMMANDS))
+
+# קווי הפרדה - מחושבים פעם אחת במקום "-" * 60 בכל סיבוב לולאה
+_THIN_LINE = "-" * 60
+_THICK_LINE = "=" * 60
+_SHORT_LINE = "-" * 50
 
 
 def print_banner():
@@ -25,13 +38,13 @@ def print_banner():
 
 def list_models():
     """הצגת רשימת המודלים הזמינים"""
-    print("\n📋 מודלים זמינים:\n")
-
-    for model_id, name, available in get_models_with_status():
-        status = "✅" if available else "❌"
-        print(f"  {status} {model_id:12} - {name}")
-
-    print("\n💡 הגדר API keys בקובץ .env או כמשתני סביבה")
+    # בניית הפלט כמחרוזת אחת וקריאת print בודדת - במקום הדפסה
+    # שורה-שורה (כל print היא קריאת I/O נפרדת ו-flush נפרד)
+    lines = "\n".join(
+        f"  {status_icon(available)} {model_id:12} - {name}"
+        for model_id, name, available in get_models_with_status()
+    )
+    print(f"\n📋 מודלים זמינים:\n\n{lines}\n\n💡 הגדר API keys בקובץ .env או כמשתני סביבה")
 
 
 async def interactive_mode():
@@ -47,38 +60,78 @@ async def interactive_mode():
 
     print(f"✅ מודלים זמינים: {', '.join(available)}\n")
 
+    # חימום ברקע: ה-clients נבנים בזמן שהמשתמש מקליד את השאלה הראשונה
+    warmup_task = asyncio.create_task(flow.warmup())
+
+    # מספר המודלים קבוע לכל חיי הסשן - נספר פעם אחת מחוץ ללולאה
+    model_count = len(available)
+
     while True:
-        print("-" * 60)
-        question = input("\n📝 הכנס שאלה (או 'exit' ליציאה):\n> ").strip()
+        print(_THIN_LINE)
+        # input חוסם - מריצים ב-thread כדי שה-event loop ימשיך לרוץ
+        # (משימות רקע כמו ניקוי connections לא נתקעות בזמן ההמתנה למשתמש)
+        question = (await asyncio.to_thread(input, "\n📝 הכנס שאלה (או 'exit' ליציאה):\n> ")).strip()
 
-        if question.lower() in ['exit', 'quit', 'q', 'יציאה']:
+        if len(question) <= _MAX_EXIT_LEN and question.lower() in _EXIT_COMMANDS:
             print("\n👋 להתראות!")
             break
 
         if not question:
             continue
 
-        print(f"\n🚀 שולח ל-{len(available)} מודלים...\n")
+        print(f"\n🚀 שולח ל-{model_count} מודלים...\n")
 
-        result = await run_flow(question, verbose=True)
+        # מחזור אותו flow בין שאלות - המודלים וה-clients כבר בנויים
+        result = await run_flow(question, verbose=True, flow=flow)
 
-        print("\n" + "=" * 60)
-        print(result.final_summary)
-        print("=" * 60)
+        # הדפסה אחת במקום שלוש - פחות קריאות write+flush לטרמינל
+        print(f"\n{_THICK_LINE}\n{result.final_summary}\n{_THICK_LINE}")
 
 
-async def run_single_question(question: str, models: list[str] = None, output_file: str = None):
-    """הרצת שאלה בודדת"""
-    result = await run_flow(question, models=models, verbose=True)
+async def run_single_question(
+    question: str,
+    models: list[str] = None,
+    output_file: str = None,
+    parallel: bool = False
+):
+    """הרצת שאלה בודדת - כל תשובה מוצגת ברגע שהיא מוכנה"""
+    if parallel:
+        # במצב מקבילי אין סדר שרשרת - ממתינים לכל התשובות יחד
+        result = await run_flow(question, models=models, verbose=True, parallel=True)
+        if not output_file:
+            print("\n" + _THICK_LINE)
+            print(result.final_summary)
+    else:
+        # הזרמת תשובות: כל מודל מודפס מיד כשהוא מסיים, בלי לחכות לשרשרת כולה
+        flow = MultiModelFlow()
+        available = flow.get_available_models()
+
+        # חימום ספקולטיבי ברקע: בזמן שהמודל הראשון עונה, ה-clients
+        # של שאר המודלים בשרשרת כבר נבנים במקביל
+        asyncio.create_task(flow.warmup())
+
+        print(f"מודלים זמינים: {', '.join(available)}")
+        print(_SHORT_LINE)
+
+        result = FlowResult(question=question)
+        async for response in flow.run_stream(question, models_to_use=models):
+            result.responses.append(response)
+            print(f"\n{status_icon(response.success)} {response.model_name}")
+            if response.success and not output_file:
+                print(_THIN_LINE)
+                print(response.content)
+
+        # הסיכום המלא נבנה רק אם באמת צריך אותו (שמירה לקובץ) -
+        # במצב הדפסה לטרמינל התשובות כבר הוצגו תוך כדי ההזרמה
+        if output_file:
+            result.final_summary = flow._generate_summary(result)
 
     if output_file:
-        # שמירה לקובץ
-        Path(output_file).write_text(result.final_summary, encoding="utf-8")
+        # שמירה לקובץ - ב-thread נפרד כדי לא לחסום את ה-event loop
+        await asyncio.to_thread(
+            Path(output_file).write_text, result.final_summary, encoding="utf-8"
+        )
         print(f"\n💾 נשמר ל: {output_file}")
-    else:
-        # הדפסה למסך
-        print("\n" + "=" * 60)
-        print(result.final_summary)
 
 
 def main():
@@ -114,6 +167,12 @@ def main():
         help="קובץ פלט לשמירת התוצאות (Markdown)"
     )
 
+    parser.add_argument(
+        "-p", "--parallel",
+        action="store_true",
+        help="שליחה לכל המודלים במקביל (דעות עצמאיות, בלי שרשור)"
+    )
+
     parser.add_argument(
         "--list",
         action="store_true",
@@ -132,7 +191,8 @@ def main():
         asyncio.run(run_single_question(
             question=args.question,
             models=args.models,
-            output_file=args.output
+            output_file=args.output,
+            parallel=args.parallel
         ))
         return
 
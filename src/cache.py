@@ -0,0 +1,102 @@
+"""
+Cache לתשובות מודלים
+חוסך קריאות API חוזרות כשאותו prompt נשלח שוב לאותו מודל
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from hashlib import blake2b
+from typing import Optional
+
+from .models.base import ModelResponse
+
+# גודל מקסימלי של ה-cache (LRU - הישן ביותר נזרק)
+DEFAULT_MAX_SIZE = 128
+
+# זמן חיים לתשובה שמורה בשניות; אחריו הערך נחשב ישן ונזרק
+# (מונע מה-cache לצבור תשובות ישנות לאורך תהליך ארוך-חיים)
+DEFAULT_TTL_SECONDS = 3600.0
+
+
+class ResponseCache:
+    """
+    Cache בזיכרון לתשובות מודלים, לפי hash של (מודל, prompt).
+
+    אותו prompt שנשלח שוב לאותו מודל (למשל בהרצה חוזרת של אותה
+    שאלה) מוחזר מיידית בלי קריאת רשת. נשמרות רק תשובות מוצלחות,
+    עם תקרת גודל (LRU) ותוקף (TTL) כדי לחסום גדילת זיכרון.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # ערך = (זמן שמירה לפי monotonic, התשובה עצמה)
+        self._entries: OrderedDict[str, tuple[float, ModelResponse]] = OrderedDict()
+
+    @staticmethod
+    def make_key(model_id: str, prompt: str) -> str:
+        """
+        בונה מפתח cache מזהה עבור (מודל, prompt).
+
+        רווחים עודפים מנורמלים וה-casefold משווה אותיות גדולות/קטנות
+        לפני ה-hash, כך ששאלה שהוקלדה עם רווח נוסף או באותיות שונות
+        ("What is Python" מול "what is python") פוגעת באותו ערך -
+        נרמול זול שחוסך קריאת LLM שלמה על prompt שזהה סמנטית.
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(model_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(" ".join(prompt.split()).casefold().encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, model_id: str, prompt: str) -> Optional[ModelResponse]:
+        """מחזיר תשובה שמורה, או None אם אין או שפג תוקפה"""
+        return self.get_by_key(self.make_key(model_id, prompt))
+
+    def get_by_key(self, key: str) -> Optional[ModelResponse]:
+        """כמו get, אבל עם מפתח שכבר חושב - חוסך hash כפול על prompts ארוכים"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            # הערך ישן מדי - זריקה ופספוס
+            del self._entries[key]
+            return None
+
+        # סימון כ"בשימוש לאחרונה"
+        self._entries.move_to_end(key)
+        # עותק הגנתי - קורא שמשנה שדות בתשובה (למשל קיצור content)
+        # לא "מרעיל" את העותק השמור עבור הפוגעים הבאים
+        return replace(response)
+
+    def set(self, model_id: str, prompt: str, response: ModelResponse) -> None:
+        """שומר תשובה מוצלחת ב-cache"""
+        self.set_by_key(self.make_key(model_id, prompt), response)
+
+    def set_by_key(self, key: str, response: ModelResponse) -> None:
+        """כמו set, אבל עם מפתח שכבר חושב"""
+        if not response.success:
+            return
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        # זריקת הערך הישן ביותר אם עברנו את הגודל המקסימלי
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """ניקוי כל ה-cache"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# cache גלובלי משותף לכל הזרימות בתהליך
+response_cache = ResponseCache()
@@ -3,11 +3,13 @@
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+# slots=True - בלי __dict__ פר-מופע, אי אפשר להוסיף שדות בטעות
+# וגישת השדות מהירה יותר (אותו שיקול כמו ב-ModelResponse)
+@dataclass(slots=True)
 class ModelConfig:
     """הגדרות למודל בודד"""
     name: str
@@ -16,7 +18,7 @@ class ModelConfig:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """הגדרות הפרויקט"""
 
@@ -44,9 +46,20 @@ class Config:
     perplexity_api_key: Optional[str] = None
     perplexity_model: str = "sonar-pro"
 
+    # תקרת זמן (בשניות) לקריאה בודדת למודל - חוסמת זנב latency:
+    # מודל תקוע לא מעכב את כל השרשרת מעבר לתקרה
+    model_timeout_seconds: float = 120.0
+
+    # תוצאה שמורה של get_available_models - המפתחות נקראים פעם אחת
+    # ממשתני הסביבה ולא משתנים, אז אין צורך לחשב מחדש בכל קריאה
+    _available_cache: Optional[list[str]] = field(
+        default=None, repr=False, compare=False
+    )
+
     @classmethod
     def from_env(cls) -> "Config":
         """טעינת הגדרות ממשתני סביבה"""
+        defaults = cls()
         return cls(
             claude_api_key=os.getenv("ANTHROPIC_API_KEY"),
             gemini_api_key=os.getenv("GEMINI_API_KEY"),
@@ -54,57 +67,71 @@ class Config:
             mistral_api_key=os.getenv("MISTRAL_API_KEY"),
             grok_api_key=os.getenv("GROK_API_KEY"),
             perplexity_api_key=os.getenv("PERPLEXITY_API_KEY"),
+            # דריסת מזהה המודל פר-ספק - מאפשרת למפעיל לבחור וריאנט
+            # זול/מהיר יותר (למשל mini/flash) בלי לגעת בקוד
+            claude_model=os.getenv("CLAUDE_MODEL", defaults.claude_model),
+            gemini_model=os.getenv("GEMINI_MODEL", defaults.gemini_model),
+            gpt_model=os.getenv("GPT_MODEL", defaults.gpt_model),
+            mistral_model=os.getenv("MISTRAL_MODEL", defaults.mistral_model),
+            grok_model=os.getenv("GROK_MODEL", defaults.grok_model),
+            perplexity_model=os.getenv("PERPLEXITY_MODEL", defaults.perplexity_model),
+            model_timeout_seconds=float(os.getenv("MODEL_TIMEOUT_SECONDS", "120")),
         )
 
     def get_available_models(self) -> list[str]:
-        """מחזיר רשימת מודלים זמינים (עם API key)"""
-        available = []
-        if self.claude_api_key:
-            available.append("claude")
-        if self.gemini_api_key:
-            available.append("gemini")
-        if self.openai_api_key:
-            available.append("gpt")
-        if self.mistral_api_key:
-            available.append("mistral")
-        if self.grok_api_key:
-            available.append("grok")
-        if self.perplexity_api_key:
-            available.append("perplexity")
-        return available
+        """מחזיר רשימת מודלים זמינים (עם API key). התוצאה ממוחזרת בין קריאות."""
+        if self._available_cache is None:
+            self._available_cache = [
+                model_id
+                for model_id, _ in MODELS_REGISTRY
+                if getattr(self, MODEL_KEY_ATTRS[model_id])
+            ]
+        return self._available_cache
 
 
 # הגדרות גלובליות
 config = Config.from_env()
 
 
-# רשימת כל המודלים - מקור יחיד לאמת
+# רשימת כל המודלים - מקור יחיד לאמת. tuple קפוא ברמת המודול -
+# נבנה פעם אחת כקבוע ואף צרכן לא יכול לשנות אותו בטעות
 # (id, display_name)
-MODELS_REGISTRY = [
+MODELS_REGISTRY = (
     ("claude", "Claude (Anthropic)"),
     ("gemini", "Gemini (Google)"),
     ("gpt", "GPT (OpenAI)"),
     ("mistral", "Mistral AI"),
     ("grok", "Grok (xAI)"),
     ("perplexity", "Perplexity (Sonar)"),
-]
+)
+
+
+# מיפוי id של מודל לשדה ה-API key שלו ב-Config - מקור יחיד לאמת,
+# במקום לבנות מחדש מילון מפתחות בכל קריאה
+MODEL_KEY_ATTRS = {
+    "claude": "claude_api_key",
+    "gemini": "gemini_api_key",
+    "gpt": "openai_api_key",
+    "mistral": "mistral_api_key",
+    "grok": "grok_api_key",
+    "perplexity": "perplexity_api_key",
+}
+
+
+# תוצאת get_models_with_status ממוחזרת - נגזרת מה-config הגלובלי
+# שקבוע מעליית התהליך, אז אין טעם לחשב את הסטטוסים מחדש בכל קריאה
+_models_with_status: Optional[list[tuple[str, str, bool]]] = None
 
 
 def get_models_with_status() -> list[tuple[str, str, bool]]:
     """
-    מחזיר רשימת כל המודלים עם סטטוס זמינות.
+    מחזיר רשימת כל המודלים עם סטטוס זמינות. התוצאה ממוחזרת בין קריאות.
     Returns: list of (id, name, available)
     """
-    api_keys = {
-        "claude": config.claude_api_key,
-        "gemini": config.gemini_api_key,
-        "gpt": config.openai_api_key,
-        "mistral": config.mistral_api_key,
-        "grok": config.grok_api_key,
-        "perplexity": config.perplexity_api_key,
-    }
-
-    return [
-        (model_id, name, bool(api_keys.get(model_id)))
-        for model_id, name in MODELS_REGISTRY
-    ]
+    global _models_with_status
+    if _models_with_status is None:
+        _models_with_status = [
+            (model_id, name, bool(getattr(config, MODEL_KEY_ATTRS[model_id])))
+            for model_id, name in MODELS_REGISTRY
+        ]
+    return _models_with_status
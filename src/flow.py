@@ -7,6 +7,7 @@ import asyncio
 from dataclasses import dataclass, field
 from typing import Optional
 
+from .cache import response_cache
 from .config import config
 from .models import (
     BaseModel,
@@ -17,10 +18,41 @@ from .models import (
     GrokModel,
     PerplexityModel,
 )
-from .models.base import ModelResponse
+from .models.base import ChainEntry, ModelResponse
 
 
-@dataclass
+# טבלת הגדרה של המודלים: id -> (מחלקה, שדה ה-API key, שדה ה-model id)
+# הוספת מודל חדש = שורה אחת כאן במקום בלוק if נוסף ב-_init_models
+_MODEL_SPECS: dict[str, tuple[type[BaseModel], str, str]] = {
+    "claude": (ClaudeModel, "claude_api_key", "claude_model"),
+    "gemini": (GeminiModel, "gemini_api_key", "gemini_model"),
+    "gpt": (GPTModel, "openai_api_key", "gpt_model"),
+    "mistral": (MistralModel, "mistral_api_key", "mistral_model"),
+    "grok": (GrokModel, "grok_api_key", "grok_model"),
+    "perplexity": (PerplexityModel, "perplexity_api_key", "perplexity_model"),
+}
+
+# קו הפרדה להדפסות verbose - מחושב פעם אחת בטעינת המודול
+_SHORT_LINE = "-" * 50
+
+# סיכום הנפילה כשאף מודל לא ענה - קבוע סטטי, אין מה לבנות בזמן ריצה
+_NO_RESPONSES_SUMMARY = "# שגיאה\nלא התקבלו תשובות מהמודלים."
+
+# הודעת השגיאה של חריגה מתקרת הזמן - התקרה קבועה מעליית התהליך,
+# אז ההודעה מעוצבת פעם אחת ולא בכל timeout
+_TIMEOUT_ERROR = f"חריגה מתקרת הזמן ({config.model_timeout_seconds:g} שניות)"
+
+# אייקוני סטטוס להדפסות - tuple שמאונדקס ישירות לפי ה-bool
+# (bool הוא int), במקום ביטוי תנאי שמשוכפל בכל נקודת הדפסה
+_STATUS_ICONS = ("❌", "✅")
+
+
+def status_icon(success: bool) -> str:
+    """אייקון סטטוס להצגה: ✅ להצלחה, ❌ לכישלון"""
+    return _STATUS_ICONS[success]
+
+
+@dataclass(slots=True)
 class FlowResult:
     """תוצאת הזרימה"""
     question: str
@@ -41,74 +73,246 @@ class MultiModelFlow:
     כל מודל מקבל את התשובות הקודמות ובונה עליהן.
     """
 
-    # סדר ברירת מחדל של המודלים
-    DEFAULT_MODEL_ORDER = [
+    # מספר קריאות API מקביליות מקסימלי במצב parallel
+    # (מגן מפני rate limits של הספקים כשיש הרבה מודלים)
+    DEFAULT_MAX_CONCURRENCY = 4
+
+    # סדר ברירת מחדל של המודלים. tuple - מבנה קבוע וקומפקטי שמשותף
+    # בין כל המופעים בלי סיכון שמופע אחד ישנה אותו לכולם
+    DEFAULT_MODEL_ORDER = (
         "claude",
         "gemini",
         "gpt",
         "mistral",
         "grok",
         "perplexity",
-    ]
+    )
 
-    def __init__(self, model_order: Optional[list[str]] = None):
+    def __init__(
+        self,
+        model_order: Optional[list[str]] = None,
+        use_cache: bool = True
+    ):
         """
         אתחול הזרימה.
 
         Args:
             model_order: סדר המודלים (אופציונלי). אם לא מסופק, משתמש בסדר ברירת המחדל.
+            use_cache: האם להשתמש ב-cache התשובות הגלובלי (ברירת מחדל: כן).
+                כיבוי שימושי כשרוצים לקבל דעה טרייה על אותה שאלה.
         """
         self.model_order = model_order or self.DEFAULT_MODEL_ORDER
+        self.use_cache = use_cache
         self.models: dict[str, BaseModel] = {}
+        # תוצאת get_available_models ממוחזרת - הרכב המודלים קבוע
+        # אחרי האתחול, ואין טעם לסנן את model_order מחדש בכל קריאה
+        self._available_models: Optional[list[str]] = None
+        # שמות התצוגה נגזרים מאותו הרכב קבוע - ממוחזרים באותו אופן
+        self._display_names: Optional[list[str]] = None
+        # התקרה נקשרת למופע פעם אחת - חוסך שרשרת lookup גלובלית
+        # (config ואז השדה) בכל קריאת מודל
+        self._timeout_seconds = config.model_timeout_seconds
+        # האם warmup כבר רץ - קריאה חוזרת על מופע ממוחזר לא בונה
+        # שוב את רשימת ה-builders ולא מריצה threads לחינם
+        self._warmed = False
         self._init_models()
 
     def _init_models(self) -> None:
-        """אתחול המודלים הזמינים"""
-        # Claude
-        if config.claude_api_key:
-            self.models["claude"] = ClaudeModel(
-                api_key=config.claude_api_key,
-                model_id=config.claude_model
-            )
+        """אתחול המודלים הזמינים לפי טבלת _MODEL_SPECS"""
+        for model_id, (model_cls, key_attr, model_attr) in _MODEL_SPECS.items():
+            api_key = getattr(config, key_attr)
+            if api_key:
+                self.models[model_id] = model_cls(
+                    api_key=api_key,
+                    model_id=getattr(config, model_attr)
+                )
 
-        # Gemini
-        if config.gemini_api_key:
-            self.models["gemini"] = GeminiModel(
-                api_key=config.gemini_api_key,
-                model_id=config.gemini_model
-            )
+    def get_available_models(self) -> list[str]:
+        """מחזיר רשימת מודלים זמינים. התוצאה מחושבת פעם אחת וממוחזרת."""
+        if self._available_models is None:
+            self._available_models = [
+                m for m in self.model_order if m in self.models
+            ]
+        return self._available_models
+
+    def get_display_names(self) -> list[str]:
+        """
+        מחזיר את שמות התצוגה של המודלים הזמינים, לפי סדר השרשרת.
+        התוצאה ממוחזרת - name הוא property שנקרא אחרת בכל בקשת API.
+        """
+        if self._display_names is None:
+            self._display_names = [
+                self.models[m].name for m in self.get_available_models()
+            ]
+        return self._display_names
 
-        # GPT
-        if config.openai_api_key:
-            self.models["gpt"] = GPTModel(
-                api_key=config.openai_api_key,
-                model_id=config.gpt_model
-            )
+    def _select_models(self, models_to_use: Optional[list[str]]) -> list[str]:
+        """
+        נרמול ואימות של רשימת המודלים בנקודת הכניסה.
 
-        # Mistral
-        if config.mistral_api_key:
-            self.models["mistral"] = MistralModel(
-                api_key=config.mistral_api_key,
-                model_id=config.mistral_model
-            )
+        מסנן מודלים לא-זמינים וכפילויות פעם אחת, כך ששאר הזרימה
+        יכולה לסמוך על כך שכל שם ברשימה קיים ב-self.models ומופיע
+        פעם אחת בלבד.
+        """
+        if models_to_use:
+            # נרמול לאותיות קטנות - "Claude" ו-"GPT" מה-CLI נחשבים תקפים;
+            # dict.fromkeys - הסרת כפילויות תוך שמירת הסדר ב-O(n)
+            # (בלי זה, מודל שהופיע פעמיים ברשימה היה נשאל פעמיים)
+            active_models = [
+                m for m in dict.fromkeys(name.lower() for name in models_to_use)
+                if m in self.models
+            ]
+        else:
+            active_models = self.get_available_models()
 
-        # Grok
-        if config.grok_api_key:
-            self.models["grok"] = GrokModel(
-                api_key=config.grok_api_key,
-                model_id=config.grok_model
+        if not active_models:
+            raise ValueError("אין מודלים זמינים! וודא שהגדרת API keys.")
+
+        return active_models
+
+    async def warmup(self) -> None:
+        """
+        בונה מראש את ה-SDK clients של כל המודלים הזמינים.
+
+        מיועד לריצה כמשימת רקע (למשל בזמן שהמשתמש מקליד את השאלה
+        הראשונה), כך שהקריאה הראשונה לא משלמת את עלות האתחול.
+        לא נשלחת אף בקשה לספקים - אין עלות tokens.
+        """
+        # אידמפוטנטי: ה-clients כבר בנויים אחרי הריצה הראשונה,
+        # וקריאה חוזרת (למשל מופע ממוחזר בין שאלות) יוצאת מיד
+        if self._warmed:
+            return
+        self._warmed = True
+
+        # בניית ה-clients היא עבודה עצמאית פר-מודל (כולל הקמת SSL
+        # context) - gather של thread לכל מודל במקום בנייה טורית
+        # ב-thread אחד, כך שהחימום מסתיים מהר יותר
+        builders = [
+            asyncio.to_thread(get_client)
+            for name in self.get_available_models()
+            if (get_client := getattr(self.models[name], "_get_client", None)) is not None
+        ]
+        if builders:
+            await asyncio.gather(*builders)
+
+    async def _generate_bounded(self, model: BaseModel, prompt: str) -> ModelResponse:
+        """
+        קריאה למודל עם תקרת זמן.
+
+        חריגה מהתקרה מוחזרת כתשובת כישלון רגילה, כך שהשרשרת ממשיכה
+        למודל הבא במקום להיתקע על ספק איטי. הערה: העבודה שרצה
+        ב-to_thread בתוך המודל לא מבוטלת בפועל - רק מפסיקים לחכות לה.
+        """
+        try:
+            return await asyncio.wait_for(
+                model.generate(prompt),
+                timeout=self._timeout_seconds
             )
+        except asyncio.TimeoutError:
+            return model._failure(_TIMEOUT_ERROR)
+
+    # קריאות זהות שבאוויר בו-זמנית (אותו מודל + אותו prompt, למשל
+    # שני לקוחות API ששלחו את אותה שאלה באותו רגע) חולקות בקשה אחת
+    # לספק במקום לשלם עליה פעמיים - "single-flight" חוצה sessions.
+    # המילון משותף לכל מופעי הזרימה בתהליך, כמו response_cache.
+    _inflight: dict[str, "asyncio.Task[ModelResponse]"] = {}
+
+    async def _generate_with_cache(self, model: BaseModel, prompt: str) -> ModelResponse:
+        """שולח prompt למודל, עם קיצור דרך דרך ה-cache אם התשובה כבר קיימת"""
+        if not self.use_cache:
+            return await self._generate_bounded(model, prompt)
+
+        # המפתח מחושב פעם אחת ומשמש גם ל-get וגם ל-set - ה-hash על
+        # prompt ארוך (סוף שרשרת) הוא העבודה היקרה כאן
+        key = response_cache.make_key(model.model_id, prompt)
+        cached = response_cache.get_by_key(key)
+        if cached is not None:
+            return cached
+
+        # הצטרפות לקריאה זהה שכבר רצה, אם קיימת
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await inflight
+
+        task = asyncio.ensure_future(self._generate_bounded(model, prompt))
+        self._inflight[key] = task
+        try:
+            response = await task
+        finally:
+            self._inflight.pop(key, None)
+        response_cache.set_by_key(key, response)
+        return response
+
+    async def run_stream(
+        self,
+        question: str,
+        models_to_use: Optional[list[str]] = None
+    ):
+        """
+        מריץ את הזרימה ומחזיר async generator של תשובות.
+
+        כל תשובה נמסרת ברגע שהמודל שלה סיים, כך שהקורא יכול להציג
+        תוצאות חלקיות בלי לחכות שכל השרשרת תסתיים.
 
-        # Perplexity
-        if config.perplexity_api_key:
-            self.models["perplexity"] = PerplexityModel(
-                api_key=config.perplexity_api_key,
-                model_id=config.perplexity_model
+        Args:
+            question: השאלה/בעיה לשליחה
+            models_to_use: רשימת מודלים לשימוש (אופציונלי)
+
+        Yields:
+            ModelResponse עבור כל מודל, לפי סדר השרשרת
+        """
+        # קיצור דרך מקומי: שאלה ריקה תיכשל ממילא בכל המודלים -
+        # נחסמת כאן במיקרו-שניות במקום לשלם סבבי רשת שתוצאתם ידועה
+        if not question.strip():
+            raise ValueError("השאלה ריקה.")
+
+        active_models = self._select_models(models_to_use)
+
+        # איסוף תשובות קודמות + הבלוקים המעוצבים שלהן. הבלוקים נאספים
+        # ברשימה ומחוברים ב-join אחד בבניית הפרומפט - בלי שרשור
+        # מחרוזות מצטבר שמקצה buffer גדל והולך בכל תשובה
+        previous_responses: list[ChainEntry] = []
+        response_blocks: list[str] = []
+
+        # המודל הראשון - אין עדיין מה להצליב מולו
+        model = self.models[active_models[0]]
+        response = await self._generate_with_cache(
+            model, model._build_chain_prompt(question, previous_responses)
+        )
+
+        # pipeline: הקריאה למודל הבא משוגרת כ-task לפני ה-yield של
+        # התשובה הנוכחית, כך שעבודת הצרכן (הדפסה לטרמינל, כתיבת
+        # אירוע SSE) חופפת לקריאת הרשת הבאה במקום להאריך את השרשרת.
+        # אם הצרכן נוטש את ה-generator, ה-task שבאוויר פשוט מסיים לבד.
+        for model_name in active_models[1:]:
+            # עדכון רשימת התשובות הקודמות והבלוק המעוצב.
+            # model.name הוא property - קשירה לשם מקומי חוסכת קריאה
+            # כפולה שלו (ושל response.content) באותו סיבוב
+            if response.success:
+                display_name = model.name
+                content = response.content
+                previous_responses.append(ChainEntry(display_name, content))
+                response_blocks.append(BaseModel._format_response_block(
+                    len(previous_responses), display_name, content
+                ))
+
+            next_model = self.models[model_name]
+            prompt = next_model._build_chain_prompt(
+                question,
+                previous_responses,
+                preformatted_responses="".join(response_blocks) or None
+            )
+            next_task = asyncio.ensure_future(
+                self._generate_with_cache(next_model, prompt)
             )
 
-    def get_available_models(self) -> list[str]:
-        """מחזיר רשימת מודלים זמינים"""
-        return [m for m in self.model_order if m in self.models]
+            yield response
+            response = await next_task
+            model = next_model
+
+        # תשובת המודל האחרון - הבלוק המעוצב שלה לא נבנה כי אין לו
+        # צרכן במורד הזרם
+        yield response
 
     async def run(
         self,
@@ -129,36 +333,80 @@ class MultiModelFlow:
         """
         result = FlowResult(question=question)
 
-        # בחירת המודלים לשימוש
-        if models_to_use:
-            active_models = [m for m in models_to_use if m in self.models]
-        else:
-            active_models = self.get_available_models()
+        # קשירת שרשרת ה-lookup result.responses.append פעם אחת
+        # לפני הלולאה במקום שני attribute lookups בכל תשובה
+        append_response = result.responses.append
+        async for response in self.run_stream(question, models_to_use):
+            append_response(response)
 
-        if not active_models:
-            raise ValueError("אין מודלים זמינים! וודא שהגדרת API keys.")
+            # קריאה ל-callback אם קיים
+            if on_response:
+                on_response(response)
+
+        # יצירת סיכום סופי
+        result.final_summary = self._generate_summary(result)
 
-        # איסוף תשובות קודמות
-        previous_responses: list[tuple[str, str]] = []
+        return result
 
-        # הרצת כל מודל בתור
-        for model_name in active_models:
-            model = self.models[model_name]
+    async def run_parallel(
+        self,
+        question: str,
+        models_to_use: Optional[list[str]] = None,
+        on_response: Optional[callable] = None,
+        max_concurrency: Optional[int] = None
+    ) -> FlowResult:
+        """
+        מריץ את כל המודלים במקביל על השאלה (ללא שרשור תשובות).
 
-            # בניית הפרומפט עם התשובות הקודמות
-            prompt = model._build_chain_prompt(question, previous_responses)
+        בניגוד ל-run, כאן כל מודל עונה באופן עצמאי - אין תלות בין
+        התשובות, ולכן אפשר לשלוח את כולן בו-זמנית. זמן הריצה הכולל
+        יורד מסכום הזמנים למקסימום שלהם.
 
-            # שליחה למודל
-            response = await model.generate(prompt)
-            result.responses.append(response)
+        Args:
+            question: השאלה/בעיה לשליחה
+            models_to_use: רשימת מודלים לשימוש (אופציונלי)
+            on_response: callback שנקרא אחרי כל תשובה (אופציונלי)
+            max_concurrency: תקרת קריאות מקביליות (ברירת מחדל:
+                DEFAULT_MAX_CONCURRENCY)
 
-            # עדכון רשימת התשובות הקודמות
-            if response.success:
-                previous_responses.append((model.name, response.content))
+        Returns:
+            FlowResult עם כל התשובות (בסדר המודלים המקורי)
+        """
+        # אותו קיצור דרך כמו ב-run_stream - בלי קריאות LLM על קלט ריק
+        if not question.strip():
+            raise ValueError("השאלה ריקה.")
 
-            # קריאה ל-callback אם קיים
+        result = FlowResult(question=question)
+
+        active_models = self._select_models(models_to_use)
+
+        # הגבלת מספר הקריאות שרצות בו-זמנית (token-bucket פשוט)
+        semaphore = asyncio.Semaphore(max_concurrency or self.DEFAULT_MAX_CONCURRENCY)
+
+        # במצב מקבילי אין תשובות קודמות, כך שהפרומפט זהה לכל המודלים -
+        # נבנה פעם אחת ומשותף במקום להיבנות מחדש N פעמים
+        shared_prompt = self.models[active_models[0]]._build_chain_prompt(question, [])
+
+        async def ask(model_name: str) -> ModelResponse:
+            model = self.models[model_name]
+            async with semaphore:
+                response = await self._generate_with_cache(model, shared_prompt)
             if on_response:
                 on_response(response)
+            return response
+
+        # שליחה לכל המודלים בו-זמנית; הסדר בתוצאה נשמר לפי סדר המודלים.
+        # return_exceptions=True - חריגה במודל אחד לא מפילה את כל ה-batch
+        responses = await asyncio.gather(
+            *(ask(m) for m in active_models),
+            return_exceptions=True
+        )
+        append_response = result.responses.append
+        for model_name, response in zip(active_models, responses):
+            if isinstance(response, BaseException):
+                # המרת החריגה לתשובת כישלון רגילה, כמו בשאר הזרימה
+                response = self.models[model_name]._failure(str(response))
+            append_response(response)
 
         # יצירת סיכום סופי
         result.final_summary = self._generate_summary(result)
@@ -166,45 +414,62 @@ class MultiModelFlow:
         return result
 
     def _generate_summary(self, result: FlowResult) -> str:
-        """יוצר סיכום סופי של כל התשובות"""
-        successful_responses = [r for r in result.responses if r.success]
+        """
+        יוצר סיכום סופי של כל התשובות.
+
+        בכוונה דטרמיניסטי - הרכבת Markdown מקומית בלבד, בלי קריאת
+        LLM נוספת "לליטוש": זו פעולת עיצוב טהורה, וסבב רשת שלם
+        (שניות + מאות tokens) רק בשבילה הוא בזבוז.
+        """
+        # חלוקה להצלחות וכישלונות במעבר אחד במקום שתי סריקות
+        successful_responses: list[ModelResponse] = []
+        failed_responses: list[ModelResponse] = []
+        for response in result.responses:
+            (successful_responses if response.success else failed_responses).append(response)
 
         if not successful_responses:
-            return "# שגיאה\nלא התקבלו תשובות מהמודלים."
+            return _NO_RESPONSES_SUMMARY
 
-        summary = f"""# סיכום Multi-Model Opinion Flow
+        # כל בלוק נבנה ב-join אחד ישירות מ-generator (בלי רשימת
+        # ביניים), והמסמך מורכב ב-f-string יחיד - buffer אחד רציף
+        # במקום רשימת parts שמתמלאת ב-append-ים
+        responses_block = "".join(
+            f"""### {i}. {response.model_name}
 
-## השאלה המקורית:
-{result.question}
+{response.content}
 
 ---
 
-## תשובות מהמודלים:
-
 """
-        for i, response in enumerate(successful_responses, 1):
-            summary += f"""### {i}. {response.model_name}
+            for i, response in enumerate(successful_responses, 1)
+        )
 
-{response.content}
+        failures_block = (
+            "\n## מודלים שנכשלו:\n" + "".join(
+                f"- **{response.model_name}**: {response.error}\n"
+                for response in failed_responses
+            )
+            if failed_responses else ""
+        )
 
----
+        return f"""# סיכום Multi-Model Opinion Flow
 
-"""
+## השאלה המקורית:
+{result.question}
+
+---
 
-        # הוספת מידע על שגיאות אם היו
-        failed_responses = [r for r in result.responses if not r.success]
-        if failed_responses:
-            summary += "\n## מודלים שנכשלו:\n"
-            for response in failed_responses:
-                summary += f"- **{response.model_name}**: {response.error}\n"
+## תשובות מהמודלים:
 
-        return summary
+{responses_block}{failures_block}"""
 
 
 async def run_flow(
     question: str,
     models: Optional[list[str]] = None,
-    verbose: bool = True
+    verbose: bool = True,
+    parallel: bool = False,
+    flow: Optional[MultiModelFlow] = None
 ) -> FlowResult:
     """
     פונקציית עזר להרצת הזרימה.
@@ -213,26 +478,37 @@ async def run_flow(
         question: השאלה לשליחה
         models: רשימת מודלים (אופציונלי)
         verbose: האם להדפיס התקדמות
+        parallel: הרצה מקבילה (דעות עצמאיות) במקום שרשור
+        flow: מופע MultiModelFlow קיים למחזור (אופציונלי).
+            מאפשר לקורא בלולאה (מצב אינטראקטיבי) לא לבנות מחדש
+            את כל המודלים וה-clients שלהם בכל שאלה.
 
     Returns:
         FlowResult עם התוצאות
     """
-    flow = MultiModelFlow()
+    if flow is None:
+        flow = MultiModelFlow()
 
     available = flow.get_available_models()
     if verbose:
         print(f"מודלים זמינים: {', '.join(available)}")
-        print("-" * 50)
+        print(_SHORT_LINE)
 
     def on_response(response: ModelResponse):
         if verbose:
-            status = "✅" if response.success else "❌"
-            print(f"{status} {response.model_name}")
-
-    result = await flow.run(
-        question=question,
-        models_to_use=models,
-        on_response=on_response
-    )
+            print(f"{status_icon(response.success)} {response.model_name}")
+
+    if parallel:
+        result = await flow.run_parallel(
+            question=question,
+            models_to_use=models,
+            on_response=on_response
+        )
+    else:
+        result = await flow.run(
+            question=question,
+            models_to_use=models,
+            on_response=on_response
+        )
 
     return result
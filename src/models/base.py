@@ -4,10 +4,12 @@ Base class לכל המודלים
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
-@dataclass
+# slots=True - אובייקט קטן יותר בלי __dict__, עם גישת שדות מהירה
+# יותר; נוצר עבור כל קריאת מודל וגם נשמר ב-cache התשובות
+@dataclass(slots=True)
 class ModelResponse:
     """תשובה מהמודל"""
     content: str  # התוכן בפורמט Markdown
@@ -16,6 +18,75 @@ class ModelResponse:
     error: Optional[str] = None
 
 
+class ChainEntry(NamedTuple):
+    """
+    תשובה קודמת אחת בשרשרת.
+    NamedTuple - תואם לאחור ל-tuple רגיל (unpacking עובד כרגיל),
+    אבל עם שמות שדות במקום אינדקסים אנונימיים.
+    """
+    model_name: str
+    content: str
+
+
+# תבניות הפרומפטים - מוגדרות פעם אחת ברמת המודול במקום להיבנות
+# בתוך הפונקציה בכל קריאה; יש מקום אחד לערוך בו את הנוסח.
+# כל הטקסט הסטטי לפני השאלה - אותו שיקול prompt caching כמו
+# בתבנית השרשרת: פרפיקס זהה בייט-בייט בין כל השאלות והמשתמשים
+FIRST_PROMPT_TEMPLATE = """אנא ענה על השאלה הבאה בפורמט Markdown מסודר.
+תן תשובה מקיפה ומפורטת.
+
+## השאלה:
+{question}"""
+
+# כל הטקסט הסטטי (הקדמה + הנחיות) נמצא בתחילת התבנית, לפני התוכן
+# המשתנה - כך הפרפיקס זהה בייט-בייט בין כל הקריאות בשרשרת ובין
+# sessions, ו-prompt caching אוטומטי של הספקים יכול לפגוע בו
+CHAIN_PROMPT_TEMPLATE = """קיבלת שאלה שכבר נענתה על ידי מודלים אחרים.
+המשימה שלך: לקרוא את התשובות הקודמות, ללמוד מהן, ולתת תשובה משודרגת שמשלבת את הרעיונות הטובים + תובנות חדשות משלך.
+
+## ההנחיות שלך:
+1. קרא את כל התשובות הקודמות בעיון
+2. זהה נקודות חזקות בכל תשובה
+3. זהה פערים או נקודות שלא כוסו
+4. תן תשובה מקיפה בפורמט Markdown שכוללת:
+   - סיכום הנקודות החשובות מהתשובות הקודמות
+   - תובנות ונקודות חדשות משלך
+   - סיכום כולל ומסקנות
+
+## השאלה המקורית:
+{question}
+
+---
+
+## תשובות קודמות:
+{responses_text}
+
+---
+
+אנא כתוב את תשובתך בפורמט Markdown מסודר:"""
+
+# פיצול התבניות סביב ה-placeholders פעם אחת בטעינת המודול -
+# ההרכבה בזמן ריצה היא join של קבועים, במקום ש-format יפרסר
+# מחדש את תווי ה-{} של התבנית בכל קריאה
+_FIRST_HEAD, _, _FIRST_TAIL = FIRST_PROMPT_TEMPLATE.partition("{question}")
+_CHAIN_HEAD, _, _chain_rest = CHAIN_PROMPT_TEMPLATE.partition("{question}")
+_CHAIN_MID, _, _CHAIN_TAIL = _chain_rest.partition("{responses_text}")
+del _chain_rest
+
+# הפרפיקס הסטטי של פרומפט השרשרת (ההקדמה וההנחיות, עד השאלה) -
+# זהה בייט-בייט בין כל הקריאות. מיוצא כדי שמודלים של ספקים עם
+# prompt caching מפורש יוכלו לסמן אותו כבלוק ניתן-לשמירה
+CHAIN_PROMPT_STATIC_PREFIX = _CHAIN_HEAD
+
+# אורך מקסימלי (בתווים) של תשובה קודמת אחת בתוך הפרומפט המשורשר.
+# בלי תקרה, הפרומפט של המודל האחרון בשרשרת גדל לינארית עם כל
+# התשובות המלאות לפניו - יותר tokens, יותר latency ויותר עלות.
+MAX_CHAIN_RESPONSE_CHARS = 8000
+
+# הסימון שמוצמד לתשובה שקוצצה - קבוע, לא נבנה מחדש בכל קיצוץ
+_TRUNCATION_SUFFIX = "\n\n[...התשובה קוצרה...]"
+
+
 class BaseModel(ABC):
     """
     Base class לכל מודלי ה-LLM.
@@ -25,6 +96,9 @@ class BaseModel(ABC):
     def __init__(self, api_key: str, model_id: str):
         self.api_key = api_key
         self.model_id = model_id
+        # SDK client נבנה פעם אחת בשימוש הראשון וממוחזר בין קריאות
+        # (בניית client חדש לכל קריאה = handshake של TCP/TLS מחדש)
+        self._client = None
 
     @property
     @abstractmethod
@@ -45,62 +119,68 @@ class BaseModel(ABC):
         """
         pass
 
+    def _failure(self, error: str) -> ModelResponse:
+        """
+        תשובת כישלון אחידה - נתיב השגיאה המשותף לכל המודלים,
+        במקום לשכפל את בניית ה-ModelResponse בכל ענף except
+        """
+        return ModelResponse(
+            content="",
+            model_name=self.name,
+            success=False,
+            error=error
+        )
+
+    @staticmethod
+    def _format_response_block(index: int, model_name: str, response: str) -> str:
+        """מעצב תשובה קודמת אחת כבלוק טקסט עבור הפרומפט המשורשר"""
+        # קיצוץ תשובות ארוכות במיוחד כדי לחסום גדילת פרומפט לאורך השרשרת
+        if len(response) > MAX_CHAIN_RESPONSE_CHARS:
+            response = response[:MAX_CHAIN_RESPONSE_CHARS] + _TRUNCATION_SUFFIX
+
+        return f"""
+### תשובה {index} - {model_name}:
+{response}
+
+---
+"""
+
     def _build_chain_prompt(
         self,
         original_question: str,
-        previous_responses: list[tuple[str, str]]
+        previous_responses: list[ChainEntry],
+        preformatted_responses: str | None = None
     ) -> str:
         """
         בונה prompt שכולל את השאלה המקורית + תשובות קודמות.
 
         Args:
             original_question: השאלה המקורית מהמשתמש
-            previous_responses: רשימת tuples של (שם_מודל, תשובה)
+            previous_responses: רשימת ChainEntry של (שם_מודל, תשובה)
+            preformatted_responses: בלוק התשובות הקודמות כשהוא כבר מעוצב
+                (אופציונלי). מאפשר לזרימה לבנות את הבלוק באופן מצטבר
+                במקום לבנות אותו מחדש עבור כל מודל בשרשרת.
 
         Returns:
             Prompt מלא לשליחה למודל
         """
-        if not previous_responses:
+        if not previous_responses and not preformatted_responses:
             # מודל ראשון - רק השאלה
-            return f"""אנא ענה על השאלה הבאה בפורמט Markdown מסודר:
-
-## השאלה:
-{original_question}
-
----
-
-אנא תן תשובה מקיפה ומפורטת בפורמט Markdown."""
+            return "".join((_FIRST_HEAD, original_question, _FIRST_TAIL))
 
         # מודל שני ואילך - כולל תשובות קודמות
-        responses_text = ""
-        for i, (model_name, response) in enumerate(previous_responses, 1):
-            responses_text += f"""
-### תשובה {i} - {model_name}:
-{response}
-
----
-"""
-
-        return f"""קיבלת שאלה שכבר נענתה על ידי מודלים אחרים.
-המשימה שלך: לקרוא את התשובות הקודמות, ללמוד מהן, ולתת תשובה משודרגת שמשלבת את הרעיונות הטובים + תובנות חדשות משלך.
-
-## השאלה המקורית:
-{original_question}
-
----
-
-## תשובות קודמות:
-{responses_text}
-
----
-
-## ההנחיות שלך:
-1. קרא את כל התשובות הקודמות בעיון
-2. זהה נקודות חזקות בכל תשובה
-3. זהה פערים או נקודות שלא כוסו
-4. תן תשובה מקיפה בפורמט Markdown שכוללת:
-   - סיכום הנקודות החשובות מהתשובות הקודמות
-   - תובנות ונקודות חדשות משלך
-   - סיכום כולל ומסקנות
-
-אנא כתוב את תשובתך בפורמט Markdown מסודר:"""
+        if preformatted_responses is not None:
+            responses_text = preformatted_responses
+        else:
+            responses_text = "".join(
+                self._format_response_block(i, model_name, response)
+                for i, (model_name, response) in enumerate(previous_responses, 1)
+            )
+
+        return "".join((
+            _CHAIN_HEAD,
+            original_question,
+            _CHAIN_MID,
+            responses_text,
+            _CHAIN_TAIL
+        ))
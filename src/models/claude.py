@@ -4,7 +4,11 @@
 
 import asyncio
 import anthropic
-from .base import BaseModel, ModelResponse
+from .base import BaseModel, ModelResponse, CHAIN_PROMPT_STATIC_PREFIX
+
+# timeout ברמת ה-client (שניות) - חיבור תקוע נסגר ברמת התעבורה
+# במקום להחזיק worker thread עד תקרת הזמן של הזרימה
+_TIMEOUT_SECONDS = 90.0
 
 
 class ClaudeModel(BaseModel):
@@ -14,16 +18,50 @@ class ClaudeModel(BaseModel):
     def name(self) -> str:
         return "Claude"
 
+    def _get_client(self) -> anthropic.Anthropic:
+        """מחזיר client ממוחזר (נבנה פעם אחת בלבד)"""
+        if self._client is None:
+            self._client = anthropic.Anthropic(
+                api_key=self.api_key,
+                timeout=_TIMEOUT_SECONDS
+            )
+        return self._client
+
+    @staticmethod
+    def _build_content(prompt: str) -> str | list[dict]:
+        """
+        מפצל פרומפט שרשרת לשני בלוקים: הפרפיקס הסטטי מסומן
+        ב-cache_control כדי ש-Anthropic ישמור עליו prompt cache
+        בין קריאות. הערה: הספק שומר רק פרפיקסים מעל סף מינימלי של
+        tokens - פרפיקס קצר מהסף פשוט לא יישמר, בלי שגיאה, כך
+        שהסימון בטוח גם אם ההנחיות יתארכו או יתקצרו.
+        """
+        if not prompt.startswith(CHAIN_PROMPT_STATIC_PREFIX):
+            # פרומפט ראשון בשרשרת - אין פרפיקס משותף לסמן
+            return prompt
+
+        return [
+            {
+                "type": "text",
+                "text": CHAIN_PROMPT_STATIC_PREFIX,
+                "cache_control": {"type": "ephemeral"}
+            },
+            {
+                "type": "text",
+                "text": prompt[len(CHAIN_PROMPT_STATIC_PREFIX):]
+            }
+        ]
+
     def _sync_generate(self, prompt: str) -> ModelResponse:
         """קריאה סינכרונית ל-API"""
         try:
-            client = anthropic.Anthropic(api_key=self.api_key)
+            client = self._get_client()
 
             message = client.messages.create(
                 model=self.model_id,
                 max_tokens=4096,
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": self._build_content(prompt)}
                 ]
             )
 
@@ -36,12 +74,7 @@ class ClaudeModel(BaseModel):
             )
 
         except Exception as e:
-            return ModelResponse(
-                content="",
-                model_name=self.name,
-                success=False,
-                error=str(e)
-            )
+            return self._failure(str(e))
 
     async def generate(self, prompt: str) -> ModelResponse:
         """שולח prompt ל-Claude ומחזיר תשובה (לא חוסם)"""
@@ -6,6 +6,11 @@ import asyncio
 import google.generativeai as genai
 from .base import BaseModel, ModelResponse
 
+# timeout לבקשה בודדת (שניות) - חיבור תקוע נסגר ברמת התעבורה
+# במקום להחזיק worker thread עד תקרת הזמן של הזרימה.
+# מועבר פעם אחת כ-dict קבוע ולא נבנה מחדש בכל קריאה
+_REQUEST_OPTIONS = {"timeout": 90}
+
 
 class GeminiModel(BaseModel):
     """מודל Gemini של Google"""
@@ -14,13 +19,19 @@ class GeminiModel(BaseModel):
     def name(self) -> str:
         return "Gemini"
 
+    def _get_client(self) -> "genai.GenerativeModel":
+        """מחזיר מופע GenerativeModel ממוחזר (נבנה פעם אחת בלבד)"""
+        if self._client is None:
+            genai.configure(api_key=self.api_key)
+            self._client = genai.GenerativeModel(self.model_id)
+        return self._client
+
     def _sync_generate(self, prompt: str) -> ModelResponse:
         """קריאה סינכרונית ל-API"""
         try:
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel(self.model_id)
+            model = self._get_client()
 
-            response = model.generate_content(prompt)
+            response = model.generate_content(prompt, request_options=_REQUEST_OPTIONS)
 
             return ModelResponse(
                 content=response.text,
@@ -29,12 +40,7 @@ class GeminiModel(BaseModel):
             )
 
         except Exception as e:
-            return ModelResponse(
-                content="",
-                model_name=self.name,
-                success=False,
-                error=str(e)
-            )
+            return self._failure(str(e))
 
     async def generate(self, prompt: str) -> ModelResponse:
         """שולח prompt ל-Gemini ומחזיר תשובה (לא חוסם)"""
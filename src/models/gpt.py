@@ -2,47 +2,12 @@
 מודל GPT (OpenAI)
 """
 
-import asyncio
-from openai import OpenAI
-from .base import BaseModel, ModelResponse
+from .openai_compat import OpenAICompatModel
 
 
-class GPTModel(BaseModel):
+class GPTModel(OpenAICompatModel):
     """מודל GPT של OpenAI"""
 
     @property
     def name(self) -> str:
         return "GPT"
-
-    def _sync_generate(self, prompt: str) -> ModelResponse:
-        """קריאה סינכרונית ל-API"""
-        try:
-            client = OpenAI(api_key=self.api_key)
-
-            response = client.chat.completions.create(
-                model=self.model_id,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=4096
-            )
-
-            content = response.choices[0].message.content
-
-            return ModelResponse(
-                content=content,
-                model_name=self.name,
-                success=True
-            )
-
-        except Exception as e:
-            return ModelResponse(
-                content="",
-                model_name=self.name,
-                success=False,
-                error=str(e)
-            )
-
-    async def generate(self, prompt: str) -> ModelResponse:
-        """שולח prompt ל-GPT ומחזיר תשובה (לא חוסם)"""
-        return await asyncio.to_thread(self._sync_generate, prompt)
@@ -14,13 +14,19 @@ from .base import BaseModel, ModelResponse
 _TIMEOUT_MS = 120_000
 _MAX_ATTEMPTS = 3
 _BACKOFF_SECONDS = 2
-# סטטוסים זמניים שמוצדק לנסות שוב (rate limit + שרת)
-_RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# סטטוסים זמניים שמוצדק לנסות שוב (rate limit + שרת).
+# frozenset - טבלת חברות קבועה שנבנית פעם אחת, ומצהירה שהקבוצה
+# לא אמורה להשתנות בזמן ריצה
+_RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# סוגי החריגות שנחשבים זמניים תמיד - ה-tuple נבנה פעם אחת במקום
+# literal חדש בכל קריאת isinstance בלולאת ה-retry
+_TRANSIENT_EXC_TYPES = (httpx.TimeoutException, httpx.NetworkError)
 
 
 def _is_transient(error: Exception) -> bool:
     """מחזיר True רק עבור שגיאות רשת/שרת זמניות."""
-    if isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+    if isinstance(error, _TRANSIENT_EXC_TYPES):
         return True
     # MistralError מחזיק status_code; 4xx שהם permanent לא ננסה שוב
     status = getattr(error, "status_code", None)
@@ -34,9 +40,15 @@ class MistralModel(BaseModel):
     def name(self) -> str:
         return "Mistral"
 
+    def _get_client(self) -> Mistral:
+        """מחזיר client ממוחזר (נבנה פעם אחת בלבד)"""
+        if self._client is None:
+            self._client = Mistral(api_key=self.api_key, timeout_ms=_TIMEOUT_MS)
+        return self._client
+
     def _sync_generate(self, prompt: str) -> ModelResponse:
         """קריאה סינכרונית ל-API עם retry רק על כשלים זמניים"""
-        client = Mistral(api_key=self.api_key, timeout_ms=_TIMEOUT_MS)
+        client = self._get_client()
         last_error: Exception | None = None
 
         for attempt in range(1, _MAX_ATTEMPTS + 1):
@@ -61,12 +73,7 @@ class MistralModel(BaseModel):
                 if attempt < _MAX_ATTEMPTS:
                     time.sleep(_BACKOFF_SECONDS * attempt)
 
-        return ModelResponse(
-            content="",
-            model_name=self.name,
-            success=False,
-            error=str(last_error) if last_error else "unknown error"
-        )
+        return self._failure(str(last_error) if last_error else "unknown error")
 
     async def generate(self, prompt: str) -> ModelResponse:
         """שולח prompt ל-Mistral ומחזיר תשובה (לא חוסם)"""
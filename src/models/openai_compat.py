@@ -0,0 +1,63 @@
+"""
+Base משותף לכל הספקים שחושפים API תואם-OpenAI
+"""
+
+import asyncio
+from typing import Optional
+
+from openai import OpenAI
+
+from .base import BaseModel, ModelResponse
+
+# timeout ברמת ה-client (שניות) - חיבור תקוע נסגר ברמת התעבורה
+# במקום להחזיק worker thread עד תקרת הזמן של הזרימה
+_TIMEOUT_SECONDS = 90.0
+
+
+class OpenAICompatModel(BaseModel):
+    """
+    מימוש משותף למודלים שמדברים בפרוטוקול OpenAI (OpenAI עצמה,
+    xAI, Perplexity) - אותו SDK ואותה קריאה, רק base_url שונה.
+    מחלקה יורשת מגדירה name ו-BASE_URL בלבד.
+    """
+
+    # None = כתובת ברירת המחדל של OpenAI
+    BASE_URL: Optional[str] = None
+
+    def _get_client(self) -> OpenAI:
+        """מחזיר client ממוחזר (נבנה פעם אחת בלבד)"""
+        if self._client is None:
+            self._client = OpenAI(
+                api_key=self.api_key,
+                base_url=self.BASE_URL,
+                timeout=_TIMEOUT_SECONDS
+            )
+        return self._client
+
+    def _sync_generate(self, prompt: str) -> ModelResponse:
+        """קריאה סינכרונית ל-API"""
+        try:
+            client = self._get_client()
+
+            response = client.chat.completions.create(
+                model=self.model_id,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=4096
+            )
+
+            content = response.choices[0].message.content
+
+            return ModelResponse(
+                content=content,
+                model_name=self.name,
+                success=True
+            )
+
+        except Exception as e:
+            return self._failure(str(e))
+
+    async def generate(self, prompt: str) -> ModelResponse:
+        """שולח prompt למודל ומחזיר תשובה (לא חוסם)"""
+        return await asyncio.to_thread(self._sync_generate, prompt)